@@ -1,14 +1,24 @@
 from groq import Groq
 from AgentUtil import AgentLogger
+from typing import Dict, List, Any
+import asyncio
 
 class LLMProvider:
     """Abstraction layer for different LLM providers"""
-    def __init__(self, provider: str, api_key: str, model: str, logger: AgentLogger):
+    def __init__(self, provider: str, api_key: str, model: str, logger: AgentLogger,
+                 base_url: str = "http://localhost:11434", keep_alive: str = "30m",
+                 timeout: tuple = (5, 120), pool_size: int = 4):
         self.provider = provider
         self.api_key = api_key
         self.model = model
         self.logger = logger
         self.client = None
+        self.async_client = None
+        self.base_url = base_url
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.last_usage: Dict[str, Any] = {}
         
         self._initialize_client()
     
@@ -17,9 +27,14 @@ class LLMProvider:
         if self.provider == "groq":
             self.client = Groq(api_key=self.api_key)
         elif self.provider == "ollama":
-            # For Ollama, we'll use requests directly
+            # For Ollama, we keep one pooled keep-alive session so every
+            # turn reuses the same TCP connection instead of opening a new one
             import requests
-            self.base_url = "http://localhost:11434"
+            from requests.adapters import HTTPAdapter
+            self.client = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+            self.client.mount("http://", adapter)
+            self.client.mount("https://", adapter)
         elif self.provider == "openrouter":
             # OpenRouter uses OpenAI-compatible API
             from openai import OpenAI
@@ -43,6 +58,28 @@ class LLMProvider:
             self.logger.log('error', f"LLM generation error: {str(e)}")
             raise
     
+    async def agenerate(self, system_prompt: str, user_message: str, max_tokens: int = 1000) -> str:
+        """Async variant of generate"""
+        if self.provider != "ollama":
+            # Groq/OpenRouter clients are sync here, run them off the event loop
+            return await asyncio.to_thread(self.generate, system_prompt, user_message, max_tokens)
+        try:
+            return await self._ollama_agenerate(system_prompt, user_message, max_tokens)
+        except Exception as e:
+            self.logger.log('error', f"LLM generation error: {str(e)}")
+            raise
+    
+    def close(self):
+        """Release pooled connections held by the sync client"""
+        if self.provider == "ollama" and self.client is not None:
+            self.client.close()
+    
+    async def aclose(self):
+        """Release pooled connections held by the async client"""
+        if self.async_client is not None:
+            await self.async_client.aclose()
+            self.async_client = None
+    
     def _groq_generate(self, system_prompt: str, user_message: str, max_tokens: int) -> str:
         """Groq API call"""
         response = self.client.chat.completions.create(
@@ -56,22 +93,65 @@ class LLMProvider:
         )
         return response.choices[0].message.content
     
-    def _ollama_generate(self, system_prompt: str, user_message: str, max_tokens: int) -> str:
-        """Ollama API call (local)"""
-        import requests
+    def _ollama_payload(self, system_prompt: str, user_message: str, max_tokens: int) -> Dict[str, Any]:
+        """Build an Ollama chat request.
         
-        response = requests.post(
-            f"{self.base_url}/api/generate",
-            json={
-                "model": self.model,
-                "prompt": f"{system_prompt}\n\n{user_message}",
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens
-                }
+        The static system prompt always goes first as its own message so the
+        rendered prompt shares a byte-identical prefix across turns; together
+        with keep_alive this lets Ollama reuse the cached KV entries for it
+        instead of re-evaluating the whole prompt every call.
+        """
+        messages: List[Dict[str, str]] = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+        return {
+            "model": self.model,
+            "messages": messages,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "num_predict": max_tokens
             }
+        }
+    
+    def _ollama_parse(self, data: Dict[str, Any]) -> str:
+        """Record token usage and extract the message text"""
+        self.last_usage = {
+            'prompt_eval_count': data.get('prompt_eval_count', 0),
+            'eval_count': data.get('eval_count', 0),
+            'load_duration': data.get('load_duration', 0)
+        }
+        return data["message"]["content"]
+    
+    def _ollama_generate(self, system_prompt: str, user_message: str, max_tokens: int) -> str:
+        """Ollama API call (local)"""
+        response = self.client.post(
+            f"{self.base_url}/api/chat",
+            json=self._ollama_payload(system_prompt, user_message, max_tokens),
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return self._ollama_parse(response.json())
+    
+    async def _ollama_agenerate(self, system_prompt: str, user_message: str, max_tokens: int) -> str:
+        """Ollama API call (local, async)"""
+        if self.async_client is None:
+            # Created lazily so it binds to the running event loop
+            import httpx
+            connect_timeout, read_timeout = self.timeout
+            self.async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_connections=self.pool_size,
+                                    max_keepalive_connections=self.pool_size)
+            )
+        response = await self.async_client.post(
+            "/api/chat",
+            json=self._ollama_payload(system_prompt, user_message, max_tokens)
         )
-        return response.json()["response"]
+        response.raise_for_status()
+        return self._ollama_parse(response.json())
     
     def _openrouter_generate(self, system_prompt: str, user_message: str, max_tokens: int) -> str:
         """OpenRouter API call"""
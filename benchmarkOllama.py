@@ -0,0 +1,251 @@
+"""
+Benchmark for the Ollama backend against a local Ollama-compatible stub.
+
+Runs the real Planner -> Executor -> Evaluator loop for a number of turns,
+once with the old per-call `requests.post` to /api/generate and once with
+the pooled LLMProvider session on /api/chat, and reports connections opened,
+average call latency and prompt-eval tokens saved per turn.
+
+The stub mimics Ollama's prefix cache: it keeps a few KV "slots" per model,
+only re-evaluates the tokens after the longest cached prefix, and unloads the
+model (dropping every slot) once it has been idle longer than keep_alive.
+Tokens are approximated by whitespace splitting.
+
+Usage: python benchmarkOllama.py --turns 10 --think-time 360
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any
+
+import requests
+
+from AgentUtil import AgentLogger, AgentState
+from LLMUtil import LLMProvider
+from Planner import Planner
+from Executor import Executor
+from Evaluator import Evaluator
+
+
+STUB_REPLY = json.dumps({
+    'intent': 'gather_info',
+    'actions': [{'type': 'extract_info', 'params': {}}],
+    'userInput': 'माझे वय ३० वर्षे आहे',
+    'extracted': {},
+    'nextPhase': 'gathering',
+    'response': 'ठीक आहे',
+    'updatedProfile': {},
+    'eligibleSchemes': [],
+    'missingInfo': []
+}, ensure_ascii=False)
+
+DEFAULT_KEEP_ALIVE = 300  # Ollama unloads an idle model after 5 minutes
+
+
+def parse_keep_alive(value: Any) -> float:
+    """Convert an Ollama keep_alive value ("30m", "10s", 60) to seconds"""
+    if value is None:
+        return DEFAULT_KEEP_ALIVE
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([smh]?)', str(value))
+    if not match:
+        return DEFAULT_KEEP_ALIVE
+    units = {'': 1, 's': 1, 'm': 60, 'h': 3600}
+    return float(match.group(1)) * units[match.group(2)]
+
+
+class StubOllamaServer(ThreadingHTTPServer):
+    """Ollama-compatible HTTP server with a simulated prefix KV cache"""
+    daemon_threads = True
+
+    def __init__(self, address, slots: int = 4):
+        super().__init__(address, StubOllamaHandler)
+        self.slots = slots
+        self.lock = threading.Lock()
+        self.clock = 0.0  # virtual seconds, advanced by the benchmark
+        self.connections = 0
+        self.cache: List[List[str]] = []
+        self.expires_at = 0.0
+
+    def evaluate(self, prompt: str, keep_alive: Any) -> Dict[str, int]:
+        """Return how many prompt tokens had to be evaluated for this call"""
+        tokens = prompt.split()
+        with self.lock:
+            if self.clock > self.expires_at:
+                self.cache = []
+            best = 0
+            for cached in self.cache:
+                common = 0
+                for a, b in zip(cached, tokens):
+                    if a != b:
+                        break
+                    common += 1
+                best = max(best, common)
+            # Most recently used slot goes last, evict from the front
+            self.cache.append(tokens)
+            self.cache = self.cache[-self.slots:]
+            self.expires_at = self.clock + parse_keep_alive(keep_alive)
+        return {'prompt_tokens': len(tokens), 'prompt_eval_count': len(tokens) - best}
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if self.path == '/api/generate':
+            prompt = body['prompt']
+        elif self.path == '/api/chat':
+            prompt = '\n\n'.join(m['content'] for m in body['messages'])
+        else:
+            self.send_error(404)
+            return
+
+        usage = self.server.evaluate(prompt, body.get('keep_alive'))
+        data = {
+            'model': body['model'],
+            'done': True,
+            'prompt_eval_count': usage['prompt_eval_count'],
+            'eval_count': len(STUB_REPLY.split())
+        }
+        if self.path == '/api/generate':
+            data['response'] = STUB_REPLY
+        else:
+            data['message'] = {'role': 'assistant', 'content': STUB_REPLY}
+
+        payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class QuietLogger(AgentLogger):
+    """AgentLogger that keeps logs without printing them"""
+    def log(self, log_type: str, message: str):
+        self.logs.append({'type': log_type, 'message': message})
+
+
+class LegacyOllamaProvider(LLMProvider):
+    """The previous Ollama call: new connection per request, no keep_alive"""
+    def _ollama_generate(self, system_prompt: str, user_message: str, max_tokens: int) -> str:
+        response = requests.post(
+            f"{self.base_url}/api/generate",
+            json={
+                "model": self.model,
+                "prompt": f"{system_prompt}\n\n{user_message}",
+                "stream": False,
+                "options": {
+                    "num_predict": max_tokens
+                }
+            }
+        )
+        data = response.json()
+        self.last_usage = {'prompt_eval_count': data.get('prompt_eval_count', 0)}
+        return data["response"]
+
+
+class UsageRecorder:
+    """Wraps a provider and records latency and token usage of every call"""
+    def __init__(self, provider: LLMProvider):
+        self.provider = provider
+        self.calls: List[Dict[str, float]] = []
+
+    def generate(self, system_prompt: str, user_message: str, max_tokens: int = 1000) -> str:
+        prompt_tokens = len(f"{system_prompt}\n\n{user_message}".split())
+        start = time.perf_counter()
+        text = self.provider.generate(system_prompt, user_message, max_tokens)
+        self.calls.append({
+            'latency': time.perf_counter() - start,
+            'prompt_tokens': prompt_tokens,
+            'prompt_eval_count': self.provider.last_usage.get('prompt_eval_count', 0)
+        })
+        return text
+
+
+def run_session(server: StubOllamaServer, provider: LLMProvider, turns: int,
+                think_time: float) -> Dict[str, float]:
+    """Drive the agent loop for a number of turns and summarise the cost"""
+    with server.lock:
+        server.connections = 0
+        server.cache = []
+        server.expires_at = 0.0
+
+    logger = QuietLogger()
+    recorder = UsageRecorder(provider)
+    planner = Planner(recorder, logger)
+    executor = Executor(recorder, logger)
+    evaluator = Evaluator(recorder, logger)
+    state = AgentState()
+
+    for turn in range(turns):
+        user_input = f"माझे वय {30 + turn} वर्षे आहे आणि मी शेतकरी आहे"
+        plan = planner.plan(user_input, state)
+        results = executor.execute(plan, state)
+        evaluation = evaluator.evaluate(results, state, plan)
+        state.conversation_history.append({'role': 'user', 'content': user_input})
+        state.conversation_history.append({'role': 'agent', 'content': evaluation.get('response', '')})
+        # Simulate the user thinking/speaking between turns
+        with server.lock:
+            server.clock += think_time
+
+    provider.close()
+    calls = recorder.calls
+    prompt_tokens = sum(c['prompt_tokens'] for c in calls)
+    evaluated = sum(c['prompt_eval_count'] for c in calls)
+    return {
+        'calls': len(calls),
+        'connections': server.connections,
+        'avg_latency_ms': 1000 * sum(c['latency'] for c in calls) / max(len(calls), 1),
+        'prompt_tokens': prompt_tokens,
+        'prompt_eval_tokens': evaluated,
+        'saved_per_turn': (prompt_tokens - evaluated) / max(turns, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Ollama backend against a local stub")
+    parser.add_argument('--turns', type=int, default=10)
+    parser.add_argument('--think-time', type=float, default=0.0,
+                        help="virtual seconds between turns (Ollama unloads idle models after keep_alive)")
+    parser.add_argument('--slots', type=int, default=4, help="KV cache slots kept by the stub")
+    args = parser.parse_args()
+
+    server = StubOllamaServer(('127.0.0.1', 0), slots=args.slots)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        legacy = LegacyOllamaProvider('ollama', '', 'llama3.2', QuietLogger(), base_url=base_url)
+        pooled = LLMProvider('ollama', '', 'llama3.2', QuietLogger(), base_url=base_url)
+        rows = [
+            ('legacy /api/generate', run_session(server, legacy, args.turns, args.think_time)),
+            ('pooled /api/chat', run_session(server, pooled, args.turns, args.think_time))
+        ]
+    finally:
+        server.shutdown()
+
+    print(f"{args.turns} turns, think time {args.think_time}s, {args.slots} KV slots\n")
+    print(f"{'backend':<22}{'calls':>7}{'conns':>7}{'avg ms':>9}{'prompt tok':>12}{'evaluated':>11}{'saved/turn':>12}")
+    for name, r in rows:
+        print(f"{name:<22}{r['calls']:>7}{r['connections']:>7}{r['avg_latency_ms']:>9.2f}"
+              f"{r['prompt_tokens']:>12}{r['prompt_eval_tokens']:>11}{r['saved_per_turn']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
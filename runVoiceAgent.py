@@ -109,6 +109,7 @@ class MarathiVoiceAgent:
             if 'बंद' in user_input or 'थांब' in user_input:
                 goodbye_msg = "धन्यवाद! शुभेच्छा!"
                 self.voice.speak(goodbye_msg)
+                self.llm_provider.close()
                 break
             
             # Agentic Loop: Plan -> Execute -> Evaluate